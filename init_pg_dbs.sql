@@ -1,3 +1,8 @@
 -- Create the kvm database
 -- This script runs during PostgreSQL container initialization
 CREATE DATABASE kvm;
+
+-- gen_random_uuid() is built into PostgreSQL 13+; the extension keeps the
+-- uuid default working on older servers.
+\connect kvm
+CREATE EXTENSION IF NOT EXISTS pgcrypto;
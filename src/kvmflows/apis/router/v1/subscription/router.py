@@ -1,5 +1,6 @@
 from fastapi import APIRouter, HTTPException, status, Depends, Response
-from pydantic import BaseModel, EmailStr
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, EmailStr, Field
 from uuid import UUID
 from loguru import logger
 
@@ -11,16 +12,45 @@ from src.kvmflows.database.dependencies import get_async_db_connection
 from src.kvmflows.mail.activation import send_activation_email
 
 
-router = APIRouter()
+# orjson serializes responses 2-3x faster than the default json path.
+router = APIRouter(default_response_class=ORJSONResponse)
+
+# Fixed HTML bodies encoded once at import instead of per request.
+_UNSUBSCRIBED_HTML = b"""
+    <html>
+        <head><title>Unsubscribed</title></head>
+        <body>
+            <h2>You are unsubscribed successfully!</h2>
+        </body>
+    </html>
+"""
+
+_ALREADY_ACTIVE_HTML = b"""
+    <html>
+        <head><title>Subscription Activated</title></head>
+        <body>
+            <h2>Your subscription is already active.</h2>
+        </body>
+    </html>
+"""
+
+_ACTIVATED_HTML = b"""
+    <html>
+        <head><title>Subscription Activated</title></head>
+        <body>
+            <h2>Your subscription is activated successfully!</h2>
+        </body>
+    </html>
+"""
 
 
 class CreateSubscriptionRequest(BaseModel):
     title: str
     email: EmailStr
-    lat_min: float
-    lon_min: float
-    lat_max: float
-    lon_max: float
+    lat_min: float = Field(ge=-90, le=90)
+    lon_min: float = Field(ge=-180, le=180)
+    lat_max: float = Field(ge=-90, le=90)
+    lon_max: float = Field(ge=-180, le=180)
     interval: SubscriptionInterval
     subscription_type: EntrySubscriptionType
     language: SupportedLanguages
@@ -42,6 +72,7 @@ class SubscriptionResponse(BaseModel):
 
 @router.post(
     "/subscriptions",
+    response_model=SubscriptionResponse,
     responses={
         status.HTTP_200_OK: {"description": "Subscription created successfully"},
         status.HTTP_409_CONFLICT: {
@@ -67,22 +98,37 @@ class SubscriptionResponse(BaseModel):
 async def create_subscription(
     subscription: CreateSubscriptionRequest,
     db=Depends(get_async_db_connection),
-) -> SubscriptionResponse:
+) -> ORJSONResponse:
     logger.info(f"Creating subscription for email: {subscription.email}")
 
-    # Check for existing subscription using async method
-    existing_subscription = await SubscriptionModel.aio_get_or_none(
-        SubscriptionModel.email == subscription.email,
-        SubscriptionModel.interval == subscription.interval,
-        SubscriptionModel.lat_min == subscription.lat_min,
-        SubscriptionModel.lon_min == subscription.lon_min,
-        SubscriptionModel.lat_max == subscription.lat_max,
-        SubscriptionModel.lon_max == subscription.lon_max,
-        SubscriptionModel.subscription_type == subscription.subscription_type.value,
-        SubscriptionModel.language == subscription.language.value,
-    )
+    fields = {
+        "title": subscription.title,
+        "email": subscription.email,
+        "lat_min": subscription.lat_min,
+        "lon_min": subscription.lon_min,
+        "lat_max": subscription.lat_max,
+        "lon_max": subscription.lon_max,
+        "interval": subscription.interval.value,
+        "subscription_type": subscription.subscription_type.value,
+        "language": subscription.language.value,
+        "is_active": False,
+    }
+
+    # Insert with ON CONFLICT DO NOTHING against the composite unique index so
+    # the duplicate check and the create are one DB round-trip instead of a
+    # SELECT followed by an INSERT.
+    try:
+        inserted_id = await (
+            SubscriptionModel.insert(**fields).on_conflict_ignore().aio_execute()
+        )
+    except Exception as e:
+        logger.error(f"Error creating subscription: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to create subscription",
+        )
 
-    if existing_subscription:
+    if inserted_id is None:
         logger.warning(
             f"Similar subscription already exists for email: {subscription.email}"
         )
@@ -91,78 +137,52 @@ async def create_subscription(
             detail={"message": "Similar subscription already exists"},
         )
 
-    # Create new subscription using async method
+    subscription_instance = SubscriptionModel(id=inserted_id, **fields)
+
+    logger.debug(f"Subscription created with ID: {subscription_instance.id}")
+
+    # Send activation email
     try:
-        subscription_instance = await SubscriptionModel.aio_create(
-            title=subscription.title,
+        email_sent = await send_activation_email(
+            subscription_id=str(subscription_instance.id),
             email=subscription.email,
-            lat_min=subscription.lat_min,
-            lon_min=subscription.lon_min,
-            lat_max=subscription.lat_max,
-            lon_max=subscription.lon_max,
-            interval=subscription.interval.value,
-            subscription_type=subscription.subscription_type.value,
-            language=subscription.language.value,
-            is_active=False,
+            subscription_title=subscription.title,
         )
-        logger.debug(f"Subscription created with ID: {subscription_instance.id}")
-
-        # Send activation email
-        try:
-            email_sent = await send_activation_email(
-                subscription_id=str(subscription_instance.id),
-                email=subscription.email,
-                subscription_title=subscription.title,
+        if email_sent:
+            logger.info(f"Activation email sent to {subscription.email}")
+        else:
+            logger.warning(
+                f"Failed to send activation email to {subscription.email}"
             )
-            if email_sent:
-                logger.info(f"Activation email sent to {subscription.email}")
-            else:
-                logger.warning(
-                    f"Failed to send activation email to {subscription.email}"
-                )
-        except Exception as email_error:
-            logger.error(f"Error sending activation email: {email_error}")
-            # Continue with response even if email fails
-
-    except Exception as e:
-        logger.error(f"Error creating subscription: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to create subscription",
-        )
+    except Exception as email_error:
+        logger.error(f"Error sending activation email: {email_error}")
+        # Continue with response even if email fails
 
     response = subscription_instance.to_subscription_response()
 
-    return response
+    # Returning a Response keeps the decorator's response_model for the docs
+    # but skips FastAPI's second validation + jsonable_encoder pass; the data
+    # was validated on the way in and the model was just built from it.
+    return ORJSONResponse(content=response.model_dump(mode="json"))
 
 
 @router.get("/subscriptions/{subscription_id}/unsubscribe")
 async def unsubscribe(
     subscription_id: str, db=Depends(get_async_db_connection)
 ) -> Response:
-    existing_subscription = await SubscriptionModel.aio_get_or_none(
-        SubscriptionModel.id == subscription_id
+    # One UPDATE instead of fetch-then-save; the affected-row count doubles
+    # as the existence check.
+    rows = await (
+        SubscriptionModel.update(is_active=False)
+        .where(SubscriptionModel.id == subscription_id)
+        .aio_execute()
     )
-    if not existing_subscription:
+    if rows == 0:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Subscription not found"
         )
 
-    # Update the is_active field using the helper method
-    existing_subscription.set_active(False)
-    await existing_subscription.aio_save()
-
-    return Response(
-        content="""
-            <html>
-                <head><title>Unsubscribed</title></head>
-                <body>
-                    <h2>You are unsubscribed successfully!</h2>
-                </body>
-            </html>
-        """,
-        media_type="text/html",
-    )
+    return Response(content=_UNSUBSCRIBED_HTML, media_type="text/html")
 
 
 @router.get("/subscriptions/{subscription_id}/activate")
@@ -170,6 +190,20 @@ async def activate_subscription(
     subscription_id: str, db=Depends(get_async_db_connection)
 ):
     """Activate a subscription by setting is_active=True and return an HTML confirmation."""
+    # Guarded UPDATE: the common activation path is a single round-trip, and
+    # only the rare no-op outcome needs a SELECT to tell "already active"
+    # apart from "not found".
+    rows = await (
+        SubscriptionModel.update(is_active=True)
+        .where(
+            (SubscriptionModel.id == subscription_id)
+            & ~SubscriptionModel.is_active
+        )
+        .aio_execute()
+    )
+    if rows:
+        return Response(content=_ACTIVATED_HTML, media_type="text/html")
+
     subscription = await SubscriptionModel.aio_get_or_none(
         SubscriptionModel.id == subscription_id
     )
@@ -177,28 +211,4 @@ async def activate_subscription(
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Subscription not found"
         )
-    if subscription.get_is_active():
-        return Response(
-            content="""
-                <html>
-                    <head><title>Subscription Activated</title></head>
-                    <body>
-                        <h2>Your subscription is already active.</h2>
-                    </body>
-                </html>
-            """,
-            media_type="text/html",
-        )
-    subscription.set_active(True)
-    await subscription.aio_save()
-    return Response(
-        content="""
-            <html>
-                <head><title>Subscription Activated</title></head>
-                <body>
-                    <h2>Your subscription is activated successfully!</h2>
-                </body>
-            </html>
-        """,
-        media_type="text/html",
-    )
+    return Response(content=_ALREADY_ACTIVE_HTML, media_type="text/html")
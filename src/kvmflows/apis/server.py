@@ -1,3 +1,5 @@
+import asyncio
+
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
@@ -6,19 +8,21 @@ from loguru import logger
 
 from src.kvmflows.config.config import config
 from src.kvmflows.apis.router.router import router
-from src.kvmflows.database.db import initialize_database, db
+from src.kvmflows.database.db import initialize_database, db, shutdown_db
 from src.kvmflows.database.subscription import SubscriptionModel
 from src.kvmflows.database.entry import Entry
 from src.kvmflows.database.connection_manager import (
     initialize_connection_manager,
     shutdown_connection_manager,
 )
+from src.kvmflows.utils.executor import SHARED_EXECUTOR
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
     logger.info("Starting up application...")
+    asyncio.get_running_loop().set_default_executor(SHARED_EXECUTOR)
     try:
         # Initialize connection manager first
         await initialize_connection_manager()
@@ -49,9 +53,8 @@ async def lifespan(app: FastAPI):
         # Shutdown connection manager
         await shutdown_connection_manager()
 
-        if not db.is_closed():
-            db.close()
-            logger.info("Database connection closed")
+        # Close the async pool and the sync connection together
+        await shutdown_db()
     except Exception as e:
         logger.warning(f"Error closing database connection: {e}")
 
@@ -62,12 +65,16 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+# The middleware answers origin/method/header membership questions on every
+# request (including preflights); hand it frozensets so those checks are O(1)
+# hash lookups instead of list scans. Methods are uppercased here since
+# Starlette compares them verbatim.
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=config.app.cors.allowed_origins,
+    allow_origins=frozenset(config.app.cors.allowed_origins),
     allow_credentials=config.app.cors.allow_credentials,
-    allow_methods=config.app.cors.allowed_methods,
-    allow_headers=config.app.cors.allowed_headers,
+    allow_methods=frozenset(m.upper() for m in config.app.cors.allowed_methods),
+    allow_headers=frozenset(config.app.cors.allowed_headers),
 )
 
 app.include_router(router)
@@ -85,6 +92,6 @@ async def main():
 
 
 if __name__ == "__main__":
-    import asyncio
+    import uvloop
 
-    asyncio.run(main())
+    uvloop.run(main())
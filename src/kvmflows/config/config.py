@@ -1,10 +1,11 @@
+import functools
 import hydra
 from hydra.core.global_hydra import GlobalHydra
 
 from datetime import datetime
 from dotenv import load_dotenv
 from omegaconf import OmegaConf
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
 from typing import List, Optional, Tuple, Union, Literal
 from rich import print
 
@@ -75,6 +76,8 @@ class OfdbConfig(BaseModel):
     max_retries: int = 10
     retry_delay: int = 5
     concurrency: int = 10
+    upsert_concurrency: int = 4
+    max_concurrent_areas: int = 3
 
 
 class DBConfig(BaseModel):
@@ -86,6 +89,8 @@ class DBConfig(BaseModel):
 
 
 class CronTriggerModel(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     year: Optional[Union[str, int]] = Field(None, description="Year to run the job")
     month: Optional[Union[str, int]] = Field(None, description="Month to run the job")
     day: Optional[Union[str, int]] = Field(
@@ -138,32 +143,44 @@ class Config(BaseModel):
     areas: List[Area]
 
 
-# Find the config file path relative to current working directory or absolute path
-cfg = None
-possible_paths = [
-    "../../..",  # Original relative path for local development
-    "/app",  # Docker container path
-    ".",  # Current directory
-]
-
-for path in possible_paths:
-    try:
-        hydra.initialize(version_base=None, config_path=path)
-        cfg = hydra.compose("config")
-        break
-    except Exception:
-        # If initialization fails, try the next path
-        if GlobalHydra.instance().is_initialized():
-            GlobalHydra.instance().clear()
-        continue
-
-if cfg is None:
-    raise RuntimeError(
-        "Could not find config.yaml file in any of the expected locations"
-    )
+# One adapter for the whole tree: pydantic builds the validator schema once
+# and validates the nested models (including the areas list) in a single
+# rust-core pass instead of model_validate walking model by model.
+_CONFIG_ADAPTER = TypeAdapter(Config)
+
+
+@functools.lru_cache(maxsize=1)
+def load_config() -> Config:
+    """Compose config.yaml via hydra and validate it, exactly once per process."""
+    # Find the config file path relative to current working directory or absolute path
+    cfg = None
+    possible_paths = [
+        "../../..",  # Original relative path for local development
+        "/app",  # Docker container path
+        ".",  # Current directory
+    ]
+
+    for path in possible_paths:
+        try:
+            hydra.initialize(version_base=None, config_path=path)
+            cfg = hydra.compose("config")
+            break
+        except Exception:
+            # If initialization fails, try the next path
+            if GlobalHydra.instance().is_initialized():
+                GlobalHydra.instance().clear()
+            continue
+
+    if cfg is None:
+        raise RuntimeError(
+            "Could not find config.yaml file in any of the expected locations"
+        )
+
+    resolved_cfg = OmegaConf.to_container(cfg, resolve=True, throw_on_missing=True)
+    return _CONFIG_ADAPTER.validate_python(resolved_cfg)
+
 
-resolved_cfg = OmegaConf.to_container(cfg, resolve=True)
-config = Config.model_validate(resolved_cfg)
+config = load_config()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,152 @@
+"""
+Consolidated cron entry point.
+
+All scheduled flows run in one process on one AsyncIOScheduler instead of one
+scheduler process (with its own interpreter heap, loguru sinks, and Postgres
+pool) per flow.
+"""
+
+import asyncio
+import functools
+import gc
+import signal
+import uvloop
+
+from apscheduler.executors.asyncio import AsyncIOExecutor
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from apscheduler.triggers.cron import CronTrigger
+from loguru import logger
+
+from src.kvmflows.config.config import config
+from src.kvmflows.crons.utils import freeze_startup_objects, logged
+from src.kvmflows.database.db import shutdown_db
+from src.kvmflows.flows.send_subscription_emails import send_subscription_emails
+from src.kvmflows.flows.sync_all_entries import sync_all_entries
+from src.kvmflows.flows.sync_recent_entries import sync_recent_entries
+from src.kvmflows.models.subscription_interval import SubscriptionInterval
+from src.kvmflows.models.subscription_types import EntrySubscriptionType
+
+
+# Each interval's trigger config is shared by its creates and updates jobs;
+# CronTrigger parses every field with dateutil and resolves the timezone, so
+# build one trigger per interval at import and reuse it for both jobs.
+_EMAIL_TRIGGERS = {
+    SubscriptionInterval.HOURLY: CronTrigger(
+        **config.crons.send_subscription_emails_hourly.trigger.model_dump(
+            exclude_none=True
+        )
+    ),
+    SubscriptionInterval.DAILY: CronTrigger(
+        **config.crons.send_subscription_emails_daily.trigger.model_dump(
+            exclude_none=True
+        )
+    ),
+    SubscriptionInterval.WEEKLY: CronTrigger(
+        **config.crons.send_subscription_emails_weekly.trigger.model_dump(
+            exclude_none=True
+        )
+    ),
+    SubscriptionInterval.MONTHLY: CronTrigger(
+        **config.crons.send_subscription_emails_monthly.trigger.model_dump(
+            exclude_none=True
+        )
+    ),
+}
+
+# The sync triggers get the same treatment: one model_dump and one
+# CronTrigger parse at import, a dict lookup at registration time.
+_SYNC_ALL_TRIGGER = CronTrigger(
+    **config.crons.sync_all_entries.trigger.model_dump(exclude_none=True)
+)
+_SYNC_RECENT_TRIGGER = CronTrigger(
+    **config.crons.sync_recent_entries.trigger.model_dump(exclude_none=True)
+)
+
+# One row per send_subscription_emails_* cron config; every enabled interval
+# gets a creates and an updates job sharing the same trigger.
+_EMAIL_JOBS = [
+    (SubscriptionInterval.HOURLY, config.crons.send_subscription_emails_hourly),
+    (SubscriptionInterval.DAILY, config.crons.send_subscription_emails_daily),
+    (SubscriptionInterval.WEEKLY, config.crons.send_subscription_emails_weekly),
+    (SubscriptionInterval.MONTHLY, config.crons.send_subscription_emails_monthly),
+]
+
+
+def _iter_enabled_jobs():
+    """Yield (coroutine factory, job name, trigger) for every enabled cron."""
+    if config.crons.sync_all_entries.enabled:
+        yield sync_all_entries, "sync_entries job", _SYNC_ALL_TRIGGER
+
+    if config.crons.sync_recent_entries.enabled:
+        yield sync_recent_entries, "sync_recent_entries job", _SYNC_RECENT_TRIGGER
+
+    for interval, cron_config in _EMAIL_JOBS:
+        if not cron_config.enabled:
+            continue
+        for subscription_type in (
+            EntrySubscriptionType.CREATES,
+            EntrySubscriptionType.UPDATES,
+        ):
+            # functools.partial instead of a lambda: binds interval and
+            # subscription_type by value, so there is no late-binding hazard.
+            yield (
+                functools.partial(
+                    send_subscription_emails, interval, subscription_type
+                ),
+                f"send_subscription_emails_{interval}_{subscription_type} job",
+                _EMAIL_TRIGGERS[interval],
+            )
+
+
+def add_enabled_jobs(scheduler: AsyncIOScheduler) -> None:
+    """Register every cron job whose config section is enabled."""
+    for coro_func, job_name, trigger in _iter_enabled_jobs():
+        logger.info("{} is enabled. Adding to scheduler...", job_name)
+        scheduler.add_job(logged(coro_func, job_name=job_name), trigger)
+
+
+async def main():
+    scheduler = AsyncIOScheduler(
+        timezone="UTC",
+        executors={"default": AsyncIOExecutor()},
+        job_defaults={
+            "max_instances": 1,
+            "coalesce": True,
+            "misfire_grace_time": 300,
+        },
+    )
+    add_enabled_jobs(scheduler)
+
+    freeze_startup_objects()
+    scheduler.start()
+
+    # docker stop sends SIGTERM, which asyncio/uvloop does not translate
+    # into anything by default - without this handler the process would die
+    # before the cleanup below ever ran. SIGINT already arrives as
+    # KeyboardInterrupt (cancelling the wait), so both stop paths end here.
+    stop_event = asyncio.Event()
+    asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, stop_event.set)
+
+    try:
+        # Every fire runs on this one loop, so the executor and connection
+        # pools built on the first run stay alive for later ones.
+        await stop_event.wait()
+        logger.info("Received SIGTERM, shutting down...")
+    finally:
+        # Runs on SIGTERM (stop event) and on SIGINT/KeyboardInterrupt
+        # (cancellation): stop firing jobs, release the DB pool while the
+        # loop still exists, and sweep once at real exit.
+        scheduler.shutdown(wait=False)
+        await shutdown_db()
+        gc.collect()
+
+
+def run_cron():
+    try:
+        uvloop.run(main())
+    except (KeyboardInterrupt, SystemExit):
+        logger.info("Scheduler stopped.")
+
+
+if __name__ == "__main__":
+    run_cron()
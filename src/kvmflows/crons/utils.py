@@ -1,27 +1,39 @@
-import asyncio
 import gc
 
 from loguru import logger
 
 
-def async_job_wrapper(coro_func, job_name="async job"):
+def freeze_startup_objects():
     """
-    Generic wrapper to run an async coroutine as a scheduled job with logging.
+    Collect whatever startup allocated and freeze the survivors.
+
+    Config, connection pools, loguru sinks and the scheduler itself live for
+    the whole process; freezing them keeps every later collection from
+    re-marking those permanent objects. Call once, after the scheduler is set
+    up but before it starts firing jobs.
+    """
+    gc.collect(2)
+    gc.freeze()
+
+
+def logged(coro_func, job_name="async job"):
+    """
+    Wrap a coroutine function for AsyncIOScheduler with start/finish logging.
+
+    There is no loop management here: the job runs directly on the
+    scheduler's own long-lived event loop.
+
     Args:
         coro_func: The coroutine function to run (no arguments)
         job_name: Name of the job for logging
     """
 
-    def wrapper():
-        logger.info(f"Starting scheduled {job_name}...")
-        # Use try-finally to ensure proper cleanup
+    async def wrapper():
+        logger.info("Starting scheduled {}...", job_name)
         try:
-            asyncio.run(coro_func())
-            logger.info(f"Scheduled {job_name} completed.")
+            await coro_func()
+            logger.info("Scheduled {} completed.", job_name)
         except Exception as e:
-            logger.error(f"Error in scheduled {job_name}: {e}")
-        finally:
-            # Force garbage collection to prevent memory leaks
-            gc.collect()
+            logger.error("Error in scheduled {}: {}", job_name, e)
 
-    return wrapper
\ No newline at end of file
+    return wrapper
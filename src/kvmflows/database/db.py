@@ -1,5 +1,9 @@
-from peewee import PostgresqlDatabase
+from playhouse.pool import PooledPostgresqlDatabase
 import peewee_async
+import psycopg2
+from psycopg2 import sql
+from contextlib import contextmanager
+from itertools import islice
 from loguru import logger
 import asyncio
 import sys
@@ -10,65 +14,286 @@ from src.kvmflows.config.config import config
 if sys.platform == "win32":
     asyncio.set_event_loop_policy(asyncio.WindowsProactorEventLoopPolicy())
 
-# Create main database connection (for backward compatibility and initialization)
-db = PostgresqlDatabase(
+# Create main database connection (for backward compatibility and initialization).
+# Pooled with explicit connection management: autoconnect=False means no
+# silent TCP+TLS+auth reconnects mid-query stalling the event loop; callers
+# open connections at their boundary (connection_context or an explicit
+# connect), and close() hands the warm socket back to the pool.
+db = PooledPostgresqlDatabase(
     config.db.name,
     user=config.db.user,
     password=config.db.password,
     host=config.db.host,
     port=config.db.port,
-    # Add connection pooling and timeout settings
-    autoconnect=True,
+    max_connections=16,
+    stale_timeout=300,
+    autoconnect=False,
+    # thread_safe must stay True: this handle is hit from the event-loop
+    # thread (flows), FastAPI's threadpool (sync dependencies), and the
+    # shared executor (startup DDL), so connection state has to remain
+    # thread-local despite the per-query threading.local lookup it costs.
     thread_safe=True,
 )
 
-# Create async database using a simpler approach for Windows compatibility
-# Use minimal connection pool for Windows
+# Async pool sized for the concurrent sync/email flows: five slots made every
+# waiting coroutine serialize behind the pool. Keep a few warm connections and
+# disable server-side JIT, which only adds planning overhead on the short
+# queries this app issues. (The aiopg/psycopg2 backend has no client-side
+# prepared-statement cache to tune.)
 async_db = peewee_async.PooledPostgresqlDatabase(
     config.db.name,
     user=config.db.user,
     password=config.db.password,
     host=config.db.host,
     port=config.db.port,
-    max_connections=5,  # Increase to handle concurrent operations
-    min_connections=1,
+    max_connections=32,
+    min_connections=4,
+    options="-c jit=off",
 )
 
 # Register the async database
 peewee_async.register_database(async_db)
 
+# Imported below the database handles on purpose, and as a module rather
+# than the class: the mixin module imports db/async_db back from here, so
+# this stays import-order-safe whichever side loads first.
+from src.kvmflows.database.mixin import updated_at_trigger  # noqa: E402
+
+
+# The existence check only needs to succeed once per process; later
+# initialize_database calls skip the extra connect/query/close round-trip.
+_db_checked = False
+
 
 async def create_database_if_not_exists():
-    """Create the database if it doesn't exist."""
-    # For database creation, we still need to use synchronous connection
-    # since peewee-async doesn't support database creation
-    postgres_db = PostgresqlDatabase(
-        "postgres",
+    """Create the database if it doesn't exist (verified once per process)."""
+    global _db_checked
+    if _db_checked:
+        return
+
+    # Database creation needs a synchronous connection to the maintenance DB;
+    # plain psycopg2 avoids building a second Peewee database object for it.
+    conn = psycopg2.connect(
+        dbname="postgres",
         user=config.db.user,
         password=config.db.password,
         host=config.db.host,
         port=config.db.port,
     )
-
     try:
-        postgres_db.connect()
-        cursor = postgres_db.execute_sql(
-            "SELECT 1 FROM pg_database WHERE datname = %s;", (config.db.name,)
-        )
-        exists = cursor.fetchone()
-
-        if not exists:
-            # Database doesn't exist, so create it
-            postgres_db.execute_sql(f"CREATE DATABASE {config.db.name};")
-            logger.info(f"Database '{config.db.name}' created successfully.")
-        else:
-            logger.info(f"Database '{config.db.name}' already exists.")
+        conn.autocommit = True  # CREATE DATABASE cannot run inside a transaction
+        with conn.cursor() as cursor:
+            cursor.execute(
+                "SELECT 1 FROM pg_database WHERE datname = %s;", (config.db.name,)
+            )
+            exists = cursor.fetchone()
+
+            if not exists:
+                # Database doesn't exist, so create it. Identifier() quotes
+                # the name properly, so names with unusual characters work
+                # and nothing from the config is ever interpolated raw.
+                cursor.execute(
+                    sql.SQL("CREATE DATABASE {};").format(
+                        sql.Identifier(config.db.name)
+                    )
+                )
+                logger.info("Database '{}' created successfully.", config.db.name)
+            else:
+                logger.info("Database '{}' already exists.", config.db.name)
+        _db_checked = True
     except Exception as e:
-        logger.error(f"Error checking/creating database: {e}")
+        logger.error("Error checking/creating database: {}", e)
         raise
     finally:
-        if not postgres_db.is_closed():
-            postgres_db.close()
+        conn.close()
+
+
+def bulk_upsert(
+    model, rows, conflict_target, preserve, batch_size=500, update_where=None
+):
+    """
+    Upsert rows with chunked INSERT ... ON CONFLICT statements in one transaction.
+
+    Batching turns one network round-trip (and one fsync) per row into one per
+    batch_size rows, which is the dominant cost of the sync flows' imports.
+
+    Args:
+        model: Peewee model class to insert into.
+        rows: Iterable of column dicts ready for insert_many.
+        conflict_target: Field list the ON CONFLICT clause targets.
+        preserve: Fields to overwrite with the incoming (EXCLUDED) values
+            when the conflict fires.
+        batch_size: Rows per INSERT statement.
+        update_where: Optional DO UPDATE guard expression; conflicting rows
+            that fail it are left untouched (no rewrite, no trigger work).
+
+    Returns:
+        int: Number of rows sent to the database.
+    """
+    total = 0
+    rows = iter(rows)
+    with db.connection_context():
+        with db.atomic():
+            while True:
+                chunk = list(islice(rows, batch_size))
+                if not chunk:
+                    break
+                model.insert_many(chunk).on_conflict(
+                    conflict_target=conflict_target,
+                    preserve=preserve,
+                    where=update_where,
+                ).execute()
+                total += len(chunk)
+    return total
+
+
+@contextmanager
+def bulk_load_session():
+    """
+    Transaction tuned for idempotent bulk loads (the COPY ingest path).
+
+    SET LOCAL scopes both settings to this transaction: asynchronous commit
+    drops the fsync wait from every batch commit and the raised work_mem
+    gives the merge's sorts and hashes room to stay in memory. Safe because
+    the ingest is idempotent - a crash simply re-runs the batch.
+    """
+    with db.connection_context():
+        with db.atomic():
+            db.execute_sql("SET LOCAL synchronous_commit = off")
+            db.execute_sql("SET LOCAL work_mem = '256MB'")
+            yield db
+
+
+def _apply_column_defaults(model):
+    """
+    Idempotently push a model's SQL DEFAULT constraints onto its table.
+
+    create_tables(safe=True) never alters pre-existing tables, so columns
+    that gained a database-side default after the table was first created
+    (updated_at/created_at/id) would otherwise stay default-less on
+    upgraded deployments and every insert omitting them would violate
+    NOT NULL. SET DEFAULT is metadata-only DDL and safe to re-run.
+    """
+    table = model._meta.table_name
+    for field in model._meta.sorted_fields:
+        for constraint in field.constraints or ():
+            constraint_sql = getattr(constraint, "sql", "")
+            if isinstance(constraint_sql, str) and constraint_sql.upper().startswith(
+                "DEFAULT "
+            ):
+                db.execute_sql(
+                    f'ALTER TABLE "{table}" '
+                    f'ALTER COLUMN "{field.column_name}" SET {constraint_sql}'
+                )
+
+
+def _create_tables_sync(models):
+    """
+    Blocking DDL: create tables and apply update triggers.
+
+    peewee-async doesn't support DDL operations, so this runs synchronous
+    Peewee calls and is meant to be dispatched to an executor thread.
+    """
+    if db.is_closed():
+        db.connect()
+
+    existing_tables = set(db.get_tables())
+
+    with db.atomic():
+        logger.info("Initializing database and creating tables...")
+
+        # Every guarded step below runs in its own nested atomic block
+        # (a savepoint): in Postgres a failed statement otherwise poisons
+        # the rest of the outer transaction, turning one logged error into
+        # a cascade of InFailedSqlTransaction failures.
+
+        # gen_random_uuid() is built in since PG13; older servers get it
+        # from pgcrypto. Best-effort so unprivileged roles on modern
+        # servers do not fail the bootstrap.
+        try:
+            with db.atomic():
+                db.execute_sql("CREATE EXTENSION IF NOT EXISTS pgcrypto")
+        except Exception as e:
+            logger.warning("Could not ensure pgcrypto extension: {}", e)
+
+        # Pre-existing tables may hold data the models' unique indexes
+        # cannot be built over (create_tables emits the index DDL for them
+        # too); give those models a chance to clean up first.
+        for model in models:
+            if model._meta.table_name not in existing_tables:
+                continue
+            dedupe = getattr(model, "dedupe_for_unique_indexes", None)
+            if dedupe is not None:
+                try:
+                    with db.atomic():
+                        dedupe()
+                    logger.info(
+                        "Deduped {} rows for unique indexes", model.__name__
+                    )
+                except Exception as e:
+                    logger.error("Error deduping {}: {}", model.__name__, e)
+
+        db.create_tables(models, safe=True)
+        logger.info("Tables created successfully.")
+
+        # Apply triggers for models that use UpdateAtTriggerMixin
+        for model in models:
+            # Bring pre-existing tables up to date with the models'
+            # database-side defaults (no-op on freshly created tables).
+            try:
+                with db.atomic():
+                    _apply_column_defaults(model)
+            except Exception as e:
+                logger.error(
+                    "Error applying column defaults for {}: {}",
+                    model.__name__,
+                    e,
+                )
+
+            if issubclass(model, updated_at_trigger.UpdateAtTriggerMixin):
+                try:
+                    with db.atomic():
+                        model.apply_update_trigger()  # Use sync method since we're in sync context
+                    logger.info("Applied update trigger for {}", model.__name__)
+                except AttributeError as e:
+                    logger.warning(
+                        "Could not apply trigger for {}: {}", model.__name__, e
+                    )
+                except Exception as e:
+                    logger.error(
+                        "Error applying trigger for {}: {}", model.__name__, e
+                    )
+
+            # Models can ship extra hand-rolled indexes (e.g. the functional
+            # GiST index on point(lng, lat) backing entry's bbox queries)
+            # the same way they ship triggers.
+            apply_spatial_index = getattr(model, "apply_spatial_index", None)
+            if apply_spatial_index is not None:
+                try:
+                    with db.atomic():
+                        apply_spatial_index()
+                    logger.info("Applied spatial index for {}", model.__name__)
+                except Exception as e:
+                    logger.error(
+                        "Error applying spatial index for {}: {}",
+                        model.__name__,
+                        e,
+                    )
+
+
+async def shutdown_db():
+    """
+    Close the async pool and the sync connection once at real shutdown.
+
+    Tearing the loop down with the pool still open leaks its sockets and
+    buffers every restart; call this from the scheduler/server stop path.
+    """
+    if not async_db.is_closed():
+        await async_db.aio_close()
+    if not db.is_closed():
+        db.close()
+    db.close_all()  # drop the pooled sockets too, not just this thread's
+    logger.info("Database connections closed")
 
 
 async def initialize_database(models):
@@ -81,38 +306,15 @@ async def initialize_database(models):
     try:
         await create_database_if_not_exists()  # Ensure database exists
 
-        # For now, use synchronous database operations for table creation
-        # as peewee-async doesn't support DDL operations
-        if db.is_closed():
-            db.connect()
-
-        with db.atomic():
-            logger.info("Initializing database and creating tables...")
-            db.create_tables(models, safe=True)
-            logger.info("Tables created successfully.")
-
-            # Apply triggers for models that use UpdateAtTriggerMixin
-            from src.kvmflows.database.mixin.updated_at_trigger import (
-                UpdateAtTriggerMixin,
-            )
-
-            for model in models:
-                if issubclass(model, UpdateAtTriggerMixin):
-                    try:
-                        model.apply_update_trigger()  # Use sync method since we're in sync context
-                        logger.info(f"Applied update trigger for {model.__name__}")
-                    except AttributeError as e:
-                        logger.warning(
-                            f"Could not apply trigger for {model.__name__}: {e}"
-                        )
-                    except Exception as e:
-                        logger.error(
-                            f"Error applying trigger for {model.__name__}: {e}"
-                        )
+        # Run the blocking DDL on the default executor so the event loop can
+        # keep servicing other startup coroutines meanwhile.
+        await asyncio.get_running_loop().run_in_executor(
+            None, _create_tables_sync, models
+        )
 
         logger.info("Database initialization completed successfully")
     except Exception as e:
-        logger.error(f"Database initialization failed: {e}")
+        logger.error("Database initialization failed: {}", e)
         raise
 
 
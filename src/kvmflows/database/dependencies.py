@@ -1,71 +1,47 @@
 from contextlib import asynccontextmanager
 from typing import Generator, AsyncGenerator
 from fastapi import Depends
-from peewee import PostgresqlDatabase
+from peewee import OperationalError, PostgresqlDatabase
 from loguru import logger
 
 from src.kvmflows.database.db import db, async_db
 
 
-async def ensure_database_connection() -> None:
-    """Ensure database connection is active and usable."""
-    try:
-        if db.is_closed():
-            db.connect()
-            logger.debug("Database connection opened")
-
-        # Test the connection
-        db.execute_sql("SELECT 1")
-        logger.debug("Database connection verified")
-
-    except Exception as e:
-        logger.error(f"Database connection error: {e}")
-        # Try to reconnect
-        try:
-            if not db.is_closed():
-                db.close()
-            db.connect()
-            logger.info("Database reconnected successfully")
-        except Exception as reconnect_error:
-            logger.error(f"Failed to reconnect to database: {reconnect_error}")
-            raise
-
-
 @asynccontextmanager
 async def database_transaction():
     """Context manager for database transactions."""
-    await ensure_database_connection()
     try:
         # For peewee-async 1.1.0, we'll use a simpler approach
         # Transaction management is handled by the AioModel itself
         yield async_db
     except Exception as e:
-        logger.error(f"Database transaction error: {e}")
+        logger.error("Database transaction error: {}", e)
         raise
 
 
 def get_db_connection() -> Generator[PostgresqlDatabase, None, None]:
     """FastAPI dependency for database connection with proper lifecycle management."""
     try:
-        # Use synchronous connection check for compatibility
-        if db.is_closed():
-            db.connect()
-
-        # Test the connection
-        db.execute_sql("SELECT 1")
-        yield db
+        # Check a pooled connection out for the duration of the request and
+        # hand it back afterwards; autoconnect is off, so the boundary is
+        # explicit here.
+        with db.connection_context():
+            if db.connection().closed:
+                raise OperationalError("Cached database connection is closed")
+            yield db
     except Exception as e:
-        logger.error(f"Database dependency error: {e}")
+        logger.error("Database dependency error: {}", e)
         raise
 
 
 async def get_async_db_connection() -> AsyncGenerator[object, None]:
     """FastAPI dependency for async database connection with proper lifecycle management."""
     try:
-        await ensure_database_connection()
+        # The async endpoints only touch async_db; probing the sync handle
+        # here pinned one of its pooled connections without ever using it.
         yield async_db
     except Exception as e:
-        logger.error(f"Async database dependency error: {e}")
+        logger.error("Async database dependency error: {}", e)
         raise
 
 
@@ -75,20 +51,21 @@ async def get_async_db_transaction() -> AsyncGenerator[object, None]:
         async with database_transaction() as db_conn:
             yield db_conn
     except Exception as e:
-        logger.error(f"Async database transaction dependency error: {e}")
+        logger.error("Async database transaction dependency error: {}", e)
         raise
 
 
 def get_db_transaction() -> Generator[PostgresqlDatabase, None, None]:
     """FastAPI dependency for database connection with transaction support."""
     try:
-        if db.is_closed():
-            db.connect()
-
-        with db.atomic():
-            yield db
+        # connection_context returns the pooled connection when the request
+        # is done; without it every threadpool worker thread would pin one
+        # of the pool's slots forever.
+        with db.connection_context():
+            with db.atomic():
+                yield db
     except Exception as e:
-        logger.error(f"Database transaction dependency error: {e}")
+        logger.error("Database transaction dependency error: {}", e)
         raise
 
 
@@ -1,4 +1,4 @@
-from typing import TypeVar, Type, Protocol, cast, Any
+from typing import Dict, Tuple, TypeVar, Type, Protocol, cast, Any
 import peewee_async
 
 from src.kvmflows.database.db import async_db, db
@@ -19,6 +19,64 @@ class ModelWithMeta(Protocol):
 ModelType = TypeVar("ModelType", bound=ModelWithMeta)
 
 
+# The statements only depend on the table name, so build them once per model
+# class instead of reassembling the f-strings on every (re-)apply.
+# Cached tuple: (function_name, trigger_name, body, function_sql, trigger_sql).
+_trigger_sql_cache: Dict[type, Tuple[str, str, str, str, str]] = {}
+
+
+def _trigger_statements(cls) -> Tuple[str, str, str, str, str]:
+    """Return the cached names, function body, and DDL pair for a model class."""
+    cached = _trigger_sql_cache.get(cls)
+    if cached is not None:
+        return cached
+
+    table_name = cls._meta.table_name
+    trigger_name = f"update_{table_name}_updated_at"
+    function_name = f"update_{table_name}_updated_at_fn"
+
+    # Kept as a standalone string so it can be compared byte-for-byte
+    # against pg_proc.prosrc, which stores exactly the text between the
+    # dollar-quote markers.
+    body = """
+        BEGIN
+          -- Record comparison short-circuits on the first differing column;
+          -- no json serialization, text buffers, or TOAST detoasting per row.
+          IF NEW IS DISTINCT FROM OLD THEN
+            NEW.updated_at = now() AT TIME ZONE 'UTC';
+          END IF;
+          RETURN NEW;
+        END;
+        """
+
+    function_sql = (
+        f"CREATE OR REPLACE FUNCTION {function_name}()\n"
+        f"RETURNS TRIGGER AS $${body}$$ LANGUAGE plpgsql;"
+    )
+
+    trigger_sql = f"""
+        DO $$
+        BEGIN
+            -- Drop the trigger if it exists
+            DROP TRIGGER IF EXISTS {trigger_name} ON {table_name};
+
+            -- Create the trigger
+            CREATE TRIGGER {trigger_name}
+            BEFORE UPDATE ON {table_name}
+            FOR EACH ROW EXECUTE PROCEDURE {function_name}();
+        END;
+        $$;
+        """
+
+    statements = (function_name, trigger_name, body, function_sql, trigger_sql)
+    _trigger_sql_cache[cls] = statements
+    return statements
+
+
+async def _fetch_one(cursor):
+    return await cursor.fetchone()
+
+
 class UpdateAtTriggerMixin:
     """A mixin that automatically updates the updated_at field when a model is updated.
     This mixin should only be used with Peewee Model classes that have an updated_at field."""
@@ -27,6 +85,10 @@ class UpdateAtTriggerMixin:
     def apply_update_trigger(cls: Type[ModelType]) -> None:
         """Creates or replaces the trigger for updating the updated_at field.
 
+        Re-running the DDL takes an ACCESS EXCLUSIVE lock on the table, so
+        when the installed function body and trigger already match the
+        desired state the whole thing is skipped.
+
         Raises:
             AttributeError: If the model doesn't have an updated_at field.
         """
@@ -36,42 +98,32 @@ class UpdateAtTriggerMixin:
                 f"Model {cls.__name__} must have an 'updated_at' field to use UpdateAtTriggerMixin"
             )
 
-        table_name = cls._meta.table_name
-        trigger_name = f"update_{table_name}_updated_at"
-        function_name = f"update_{table_name}_updated_at_fn"
+        function_name, trigger_name, body, function_sql, trigger_sql = (
+            _trigger_statements(cls)
+        )
+
+        row = db.execute_sql(
+            "SELECT prosrc FROM pg_proc WHERE proname = %s", (function_name,)
+        ).fetchone()
+        if row and row[0] == body:
+            if db.execute_sql(
+                "SELECT 1 FROM pg_trigger WHERE tgname = %s", (trigger_name,)
+            ).fetchone():
+                return
 
         # Create or replace function with a unique name per table
-        db.execute_sql(f"""
-        CREATE OR REPLACE FUNCTION {function_name}()
-        RETURNS TRIGGER AS $$
-        BEGIN
-          IF row_to_json(NEW)::text IS DISTINCT FROM row_to_json(OLD)::text THEN
-            NEW.updated_at = now() AT TIME ZONE 'UTC';
-          END IF;
-          RETURN NEW;
-        END;
-        $$ LANGUAGE plpgsql;
-        """)
+        db.execute_sql(function_sql)
 
         # Drop existing trigger if it exists and create a new one
-        db.execute_sql(f"""
-        DO $$
-        BEGIN
-            -- Drop the trigger if it exists
-            DROP TRIGGER IF EXISTS {trigger_name} ON {table_name};
-            
-            -- Create the trigger
-            CREATE TRIGGER {trigger_name}
-            BEFORE UPDATE ON {table_name}
-            FOR EACH ROW EXECUTE PROCEDURE {function_name}();
-        END;
-        $$;
-        """)
+        db.execute_sql(trigger_sql)
 
     @classmethod
     async def apply_update_trigger_async(cls: Type[ModelType]) -> None:
         """Creates or replaces the trigger for updating the updated_at field asynchronously.
 
+        Skips the DDL entirely when the installed function body and trigger
+        already match, same as the sync variant.
+
         Raises:
             AttributeError: If the model doesn't have an updated_at field.
         """
@@ -81,37 +133,29 @@ class UpdateAtTriggerMixin:
                 f"Model {cls.__name__} must have an 'updated_at' field to use UpdateAtTriggerMixin"
             )
 
-        table_name = cls._meta.table_name
-        trigger_name = f"update_{table_name}_updated_at"
-        function_name = f"update_{table_name}_updated_at_fn"
+        function_name, trigger_name, body, function_sql, trigger_sql = (
+            _trigger_statements(cls)
+        )
+
+        row = await async_db.aio_execute_sql(
+            "SELECT prosrc FROM pg_proc WHERE proname = %s",
+            [function_name],
+            fetch_results=_fetch_one,
+        )
+        if row and row[0] == body:
+            trigger_row = await async_db.aio_execute_sql(
+                "SELECT 1 FROM pg_trigger WHERE tgname = %s",
+                [trigger_name],
+                fetch_results=_fetch_one,
+            )
+            if trigger_row:
+                return
 
         # Create or replace function with a unique name per table
-        await async_db.execute_sql(f"""
-        CREATE OR REPLACE FUNCTION {function_name}()
-        RETURNS TRIGGER AS $$
-        BEGIN
-          IF row_to_json(NEW)::text IS DISTINCT FROM row_to_json(OLD)::text THEN
-            NEW.updated_at = now() AT TIME ZONE 'UTC';
-          END IF;
-          RETURN NEW;
-        END;
-        $$ LANGUAGE plpgsql;
-        """)
+        await async_db.aio_execute_sql(function_sql)
 
         # Drop existing trigger if it exists and create a new one
-        await async_db.execute_sql(f"""
-        DO $$
-        BEGIN
-            -- Drop the trigger if it exists
-            DROP TRIGGER IF EXISTS {trigger_name} ON {table_name};
-            
-            -- Create the trigger
-            CREATE TRIGGER {trigger_name}
-            BEFORE UPDATE ON {table_name}
-            FOR EACH ROW EXECUTE PROCEDURE {function_name}();
-        END;
-        $$;
-        """)
+        await async_db.aio_execute_sql(trigger_sql)
 
     @classmethod
     def create_table_with_trigger(cls, safe: bool = True, **options) -> None:
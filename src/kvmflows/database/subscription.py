@@ -1,24 +1,45 @@
-import uuid
-
-from peewee import CharField, FloatField, DateTimeField, BooleanField, UUIDField
+from peewee import (
+    SQL,
+    BooleanField,
+    CharField,
+    DateTimeField,
+    FloatField,
+    TextField,
+    UUIDField,
+)
 from peewee_async import AioModel
-from datetime import datetime, timezone
 from typing import Dict, Any
 
-from src.kvmflows.database.db import async_db
+from src.kvmflows.database.db import async_db, db
 from src.kvmflows.database.mixin.updated_at_trigger import UpdateAtTriggerMixin
 from src.kvmflows.models.subscription import Subscription
+from src.kvmflows.models.subscription_interval import SubscriptionInterval
 from src.kvmflows.models.subscription_types import EntrySubscriptionType
+from src.kvmflows.models.supported_languages import SupportedLanguages
+
 
+# The router imports this module, so its SubscriptionResponse class can only
+# be imported lazily; cache it in a module global after the first call so
+# later calls are one attribute load instead of an import-machinery walk.
+_RESPONSE_CLS = None
 
-def utc_now():
-    """Return current UTC timestamp."""
-    return datetime.now(timezone.utc)
+
+def _get_response_cls():
+    global _RESPONSE_CLS
+    if _RESPONSE_CLS is None:
+        from src.kvmflows.apis.router.v1.subscription.router import (
+            SubscriptionResponse,
+        )
+
+        _RESPONSE_CLS = SubscriptionResponse
+    return _RESPONSE_CLS
 
 
 class SubscriptionModel(AioModel, UpdateAtTriggerMixin):
-    id = UUIDField(primary_key=True, default=uuid.uuid4)
-    title: CharField = CharField()
+    # Postgres generates the key (gen_random_uuid is built in since PG13);
+    # inserts that omit id skip a Python-side urandom read + UUID build.
+    id = UUIDField(primary_key=True, constraints=[SQL("DEFAULT gen_random_uuid()")])
+    title: TextField = TextField()  # user-supplied, so no 255-char ceiling
     email: CharField = CharField()
     lat_min: FloatField = FloatField()
     lon_min: FloatField = FloatField()
@@ -28,65 +49,102 @@ class SubscriptionModel(AioModel, UpdateAtTriggerMixin):
     subscription_type: CharField = CharField()
     is_active: BooleanField = BooleanField(default=True)
     language: CharField = CharField(default="en")
-    created_at: DateTimeField = DateTimeField(default=utc_now)
-    updated_at: DateTimeField = DateTimeField(default=utc_now)
+    # Postgres-side defaults: inserts that leave these unset cost no Python
+    # datetime construction per row.
+    created_at: DateTimeField = DateTimeField(constraints=[SQL("DEFAULT now()")])
+    updated_at: DateTimeField = DateTimeField(constraints=[SQL("DEFAULT now()")])
 
     class Meta:
         database = async_db
         table_name = "subscriptions"
+        # Write only changed columns on save() (e.g. the is_active flips).
+        only_save_dirty = True
+        # Uniqueness over the "similar subscription" predicate so the API can
+        # create-or-detect-conflict in one INSERT ... ON CONFLICT round-trip.
+        indexes = (
+            (
+                (
+                    "email",
+                    "interval",
+                    "lat_min",
+                    "lon_min",
+                    "lat_max",
+                    "lon_max",
+                    "subscription_type",
+                    "language",
+                ),
+                True,
+            ),
+        )
 
     @classmethod
-    def from_pydantic(cls, subscription: Subscription) -> "SubscriptionModel":
-        return cls(
-            id=subscription.id if subscription.id is not None else str(uuid.uuid4()),
-            title=subscription.title,
-            email=str(subscription.email),
-            lat_min=subscription.lat_min,
-            lon_min=subscription.lon_min,
-            lat_max=subscription.lat_max,
-            lon_max=subscription.lon_max,
-            interval=subscription.interval,
-            subscription_type=subscription.subscription_type.value,
-            created_at=subscription.created_at,
+    def dedupe_for_unique_indexes(cls) -> None:
+        """Delete older duplicates of the "similar subscription" key.
+
+        Deployments that predate the composite unique index could accumulate
+        duplicates through the old racy SELECT-then-INSERT; the index cannot
+        be created over them, so the bootstrap clears them first. The newest
+        row per key (by created_at, then id) survives.
+        """
+        db.execute_sql(
+            """
+            DELETE FROM subscriptions older
+            USING subscriptions newer
+            WHERE older.email = newer.email
+              AND older.interval = newer.interval
+              AND older.lat_min = newer.lat_min
+              AND older.lon_min = newer.lon_min
+              AND older.lat_max = newer.lat_max
+              AND older.lon_max = newer.lon_max
+              AND older.subscription_type = newer.subscription_type
+              AND older.language = newer.language
+              AND (older.created_at, older.id) < (newer.created_at, newer.id)
+            """
         )
 
+    @classmethod
+    def from_pydantic(cls, subscription: Subscription) -> "SubscriptionModel":
+        data = {
+            "title": subscription.title,
+            "email": str(subscription.email),
+            "lat_min": subscription.lat_min,
+            "lon_min": subscription.lon_min,
+            "lat_max": subscription.lat_max,
+            "lon_max": subscription.lon_max,
+            "interval": subscription.interval,
+            "subscription_type": subscription.subscription_type.value,
+            "created_at": subscription.created_at,
+        }
+        # No id -> leave the column unset so the database default assigns it.
+        if subscription.id is not None:
+            data["id"] = subscription.id
+        return cls(**data)
+
     def to_pydantic(self) -> Subscription:
-        return Subscription(
-            id=str(getattr(self, "id")),
-            title=getattr(self, "title"),
-            email=getattr(self, "email"),
-            lat_min=getattr(self, "lat_min"),
-            lon_min=getattr(self, "lon_min"),
-            lat_max=getattr(self, "lat_max"),
-            lon_max=getattr(self, "lon_max"),
-            interval=getattr(self, "interval"),
-            subscription_type=EntrySubscriptionType(getattr(self, "subscription_type")),
-            created_at=getattr(self, "created_at"),
+        # Rows from the database are trusted, so bypass validation with
+        # model_construct; id and subscription_type still need their explicit
+        # coercions since construct won't run them.
+        data = self.__data__
+        return Subscription.model_construct(
+            id=str(data["id"]),
+            title=data["title"],
+            email=data["email"],
+            lat_min=data["lat_min"],
+            lon_min=data["lon_min"],
+            lat_max=data["lat_max"],
+            lon_max=data["lon_max"],
+            interval=data["interval"],
+            subscription_type=EntrySubscriptionType(data["subscription_type"]),
+            created_at=data["created_at"],
         )
 
     def to_dict(self) -> Dict[str, Any]:
-        return {
-            "id": self.id,
-            "title": self.title,
-            "email": self.email,
-            "lat_min": self.lat_min,
-            "lon_min": self.lon_min,
-            "lat_max": self.lat_max,
-            "lon_max": self.lon_max,
-            "interval": self.interval,
-            "subscription_type": self.subscription_type,
-            "created_at": self.created_at,
-            "updated_at": self.updated_at,
-        }
+        # __data__ already holds the loaded fields as a plain dict.
+        return dict(self.__data__)
 
     def to_subscription_response(self):
         """Convert to SubscriptionResponse model for API responses."""
-        from src.kvmflows.models.subscription_interval import SubscriptionInterval
-        from src.kvmflows.models.subscription_types import EntrySubscriptionType
-        from src.kvmflows.models.supported_languages import SupportedLanguages
-
-        # Import here to avoid circular imports
-        from src.kvmflows.apis.router.v1.subscription.router import SubscriptionResponse
+        SubscriptionResponse = _get_response_cls()
 
         return SubscriptionResponse(
             id=self.id,  # type: ignore
@@ -1,11 +1,13 @@
 import asyncio
+import functools
 import sys
 
 from typing import List
 from loguru import logger
+from peewee import EXCLUDED
 
-from src.kvmflows.config.config import config 
-from src.kvmflows.database.db import db
+from src.kvmflows.config.config import config
+from src.kvmflows.database.db import bulk_upsert, db
 from src.kvmflows.models.entries import Entry as PydanticEntry
 from src.kvmflows.database.entry import Entry
 
@@ -18,6 +20,46 @@ logger.add(
 )
 
 
+# Fields overwritten with the incoming (EXCLUDED) values on conflict - every
+# column except id and updated_at. Constant across calls, so built once here
+# instead of per batch.
+_ENTRY_UPSERT_UPDATE_FIELDS = [
+    Entry.created,
+    Entry.version,
+    Entry.title,
+    Entry.description,
+    Entry.lat,
+    Entry.lng,
+    Entry.street,
+    Entry.zip,
+    Entry.city,
+    Entry.country,
+    Entry.state,
+    Entry.contact_name,
+    Entry.email,
+    Entry.telephone,
+    Entry.homepage,
+    Entry.opening_hours,
+    Entry.founded_on,
+    Entry.license,
+    Entry.image_url,
+    Entry.image_link_url,
+    Entry.categories,
+    Entry.tags,
+    Entry.ratings,
+]
+
+
+# Size batches by parameter budget rather than a fixed row count: Postgres
+# caps a statement at 65535 bind parameters, and staying around half of that
+# keeps server-side plan time and memory flat. +1 covers the id column.
+_UPSERT_BATCH_SIZE = max(1, 32_000 // (len(_ENTRY_UPSERT_UPDATE_FIELDS) + 1))
+
+# COPY into a temp table beats parameterized INSERTs from roughly this many
+# rows; below it the temp-table DDL round-trips dominate.
+_COPY_MIN_BATCH = 100
+
+
 async def bulk_upsert_entries(pydantic_entries: List[PydanticEntry]) -> int:
     """
     Bulk upsert entries into the database.
@@ -32,62 +74,47 @@ async def bulk_upsert_entries(pydantic_entries: List[PydanticEntry]) -> int:
         logger.debug("No entries to upsert")
         return 0
 
-    logger.info(f"Starting bulk upsert of {len(pydantic_entries)} entries")
+    logger.info("Starting bulk upsert of {} entries", len(pydantic_entries))
 
     try:
-        # Convert Pydantic entries to database entries
-        db_entries = [Entry.from_pydantic(entry) for entry in pydantic_entries]
-
-        # Prepare data for bulk insert with conflict resolution
-        entry_data = []
-        for db_entry in db_entries:
-            entry_dict = db_entry.to_dict()
-            # Remove the updated_at field as it will be set by the trigger
-            entry_dict.pop("updated_at", None)
-            entry_data.append(entry_dict)
-
-        if entry_data:
-            # Use bulk insert with ON CONFLICT DO UPDATE
-            # This will insert new entries or update existing ones based on the primary key (id)
-            with db.atomic():
-                # Build the conflict update dictionary for all fields except id and updated_at
-                # We'll manually specify the fields to update
-                update_fields = {
-                    Entry.created: Entry.created,
-                    Entry.version: Entry.version,
-                    Entry.title: Entry.title,
-                    Entry.description: Entry.description,
-                    Entry.lat: Entry.lat,
-                    Entry.lng: Entry.lng,
-                    Entry.street: Entry.street,
-                    Entry.zip: Entry.zip,
-                    Entry.city: Entry.city,
-                    Entry.country: Entry.country,
-                    Entry.state: Entry.state,
-                    Entry.contact_name: Entry.contact_name,
-                    Entry.email: Entry.email,
-                    Entry.telephone: Entry.telephone,
-                    Entry.homepage: Entry.homepage,
-                    Entry.opening_hours: Entry.opening_hours,
-                    Entry.founded_on: str(Entry.founded_on),
-                    Entry.license: Entry.license,
-                    Entry.image_url: Entry.image_url,
-                    Entry.image_link_url: Entry.image_link_url,
-                    Entry.categories: Entry.categories,
-                    Entry.tags: Entry.tags,
-                    Entry.ratings: Entry.ratings,
-                }
-
-                query = Entry.insert_many(entry_data).on_conflict(
-                    conflict_target=[Entry.id], update=update_fields
-                )
-
-                query.execute()
-                logger.success(f"Successfully bulk upserted {len(entry_data)} entries")
-                return len(entry_data)
+        if len(pydantic_entries) >= _COPY_MIN_BATCH:
+            # Large batches stream through COPY into a temp table plus one
+            # merging INSERT ... ON CONFLICT - no per-row bind parameters at
+            # all. Carries the same version guard as the path below.
+            upserted = await Entry.copy_from_pydantic(pydantic_entries)
+        else:
+            # Lazy conversion: bulk_upsert's chunking pulls dicts from the
+            # generator as each batch is built, so the pydantic list and the
+            # insert dicts never coexist fully in memory.
+            entry_iter = (
+                Entry.dict_from_pydantic(entry) for entry in pydantic_entries
+            )
+
+            # Batched INSERT ... ON CONFLICT DO UPDATE inside one transaction;
+            # inserts new entries or updates existing ones by primary key (id).
+            # OFDB bumps version on every edit, so guarding the DO UPDATE on
+            # a newer version leaves unchanged rows completely untouched
+            # during re-ingest passes (no row rewrite, no trigger work).
+            # The batched statements are blocking psycopg2 work, so they run
+            # on the shared executor and the event loop stays free to drive
+            # the next HTTP fetch in parallel.
+            upserted = await asyncio.get_running_loop().run_in_executor(
+                None,
+                functools.partial(
+                    bulk_upsert,
+                    Entry,
+                    entry_iter,
+                    conflict_target=[Entry.id],
+                    preserve=_ENTRY_UPSERT_UPDATE_FIELDS,
+                    batch_size=_UPSERT_BATCH_SIZE,
+                    update_where=(EXCLUDED.version > Entry.version),
+                ),
+            )
+        logger.success("Successfully bulk upserted {} entries", upserted)
+        return upserted
 
     except Exception as e:
-        logger.error(f"Error during bulk upsert: {e}")
+        logger.error("Error during bulk upsert: {}", e)
         # Fallback to individual upserts using async operations
         logger.info("Falling back to individual async upserts")
         return await fallback_individual_upserts(pydantic_entries)
@@ -135,25 +162,27 @@ async def fallback_individual_upserts(pydantic_entries: List[PydanticEntry]) ->
                     if updated_rows == 0:
                         # Entry doesn't exist, create it
                         Entry.create(**entry_dict)
-                        logger.debug(f"Created entry: {pydantic_entry.id}")
+                        logger.debug("Created entry: {}", pydantic_entry.id)
                     else:
-                        logger.debug(f"Updated entry: {pydantic_entry.id}")
+                        logger.debug("Updated entry: {}", pydantic_entry.id)
 
                     success_count += 1
 
                 except Exception as e:
-                    logger.error(f"Error upserting entry {pydantic_entry.id}: {e}")
+                    logger.error("Error upserting entry {}: {}", pydantic_entry.id, e)
                     error_count += 1
                     # Continue with other entries instead of failing the entire batch
                     continue
 
     except Exception as e:
-        logger.error(f"Database connection error during fallback upserts: {e}")
+        logger.error("Database connection error during fallback upserts: {}", e)
         # If sync operations also fail, try async one more time with better error handling
         return await safe_async_fallback_upserts(pydantic_entries)
 
     logger.info(
-        f"Individual upsert completed: {success_count} successful, {error_count} errors"
+        "Individual upsert completed: {} successful, {} errors",
+        success_count,
+        error_count,
     )
     return success_count
 
@@ -170,15 +199,14 @@ async def safe_async_fallback_upserts(pydantic_entries: List[PydanticEntry]) ->
     """
     success_count = 0
     error_count = 0
+    consecutive_errors = 0
 
     for pydantic_entry in pydantic_entries:
         try:
             # Use a more robust approach with explicit connection handling
             try:
-                # Try to get existing entry
-                existing_entry = await Entry.aio_get_or_none(
-                    Entry.id == pydantic_entry.id
-                )
+                # Try to get existing entry via the prebuilt statement
+                existing_entry = await Entry.aio_get_by_id(pydantic_entry.id)
 
                 if existing_entry:
                     # Update existing entry
@@ -190,29 +218,36 @@ async def safe_async_fallback_upserts(pydantic_entries: List[PydanticEntry]) ->
                         ):  # Skip updated_at as it's handled by trigger
                             setattr(existing_entry, field_name, value)
                     await existing_entry.aio_save()
-                    logger.debug(f"Updated entry: {pydantic_entry.id}")
+                    logger.debug("Updated entry: {}", pydantic_entry.id)
                 else:
                     # Create new entry
                     new_entry = Entry.from_pydantic(pydantic_entry)
                     await new_entry.aio_save()
-                    logger.debug(f"Created entry: {pydantic_entry.id}")
+                    logger.debug("Created entry: {}", pydantic_entry.id)
 
                 success_count += 1
+                consecutive_errors = 0
 
             except Exception as conn_error:
                 # Log the specific connection error but continue
                 logger.warning(
-                    f"Connection error for entry {pydantic_entry.id}: {conn_error}"
+                    "Connection error for entry {}: {}", pydantic_entry.id, conn_error
                 )
                 error_count += 1
-                # Small delay to allow connection cleanup
-                await asyncio.sleep(0.01)
+                consecutive_errors += 1
+                # Back off only when errors streak: a lone failure costs no
+                # idle time, a burst ramps up to 100 ms between attempts to
+                # give the connection a chance to recover.
+                if consecutive_errors > 1:
+                    await asyncio.sleep(min(0.1, 0.005 * consecutive_errors))
 
         except Exception as e:
-            logger.error(f"Critical error upserting entry {pydantic_entry.id}: {e}")
+            logger.error("Critical error upserting entry {}: {}", pydantic_entry.id, e)
             error_count += 1
 
     logger.info(
-        f"Safe async upsert completed: {success_count} successful, {error_count} errors"
+        "Safe async upsert completed: {} successful, {} errors",
+        success_count,
+        error_count,
     )
     return success_count
\ No newline at end of file
@@ -8,16 +8,28 @@ This module handles the complete flow of:
 4. Sending bulk emails via Mailgun
 """
 
+import asyncio
+import numpy as np
+
 from pathlib import Path
-from typing import List
+from typing import Dict, List, Optional
 from datetime import datetime
+from jinja2 import (
+    Environment,
+    FileSystemBytecodeCache,
+    FileSystemLoader,
+    select_autoescape,
+)
 from loguru import logger
-from liquid import Template
+from peewee import SQL
 
 from src.kvmflows.models.subscription import Subscription
 from src.kvmflows.models.entries import Entry
 from src.kvmflows.models.subscription_types import EntrySubscriptionType
-from src.kvmflows.models.subscription_interval import SubscriptionInterval
+from src.kvmflows.models.subscription_interval import (
+    IntervalDatetimes,
+    SubscriptionInterval,
+)
 from src.kvmflows.database.subscription import SubscriptionModel
 from src.kvmflows.database.entry import Entry as EntryModel
 from src.kvmflows.config.config import config
@@ -49,7 +61,9 @@ async def send_subscription_emails(
     The function tracks and logs success/failure statistics for monitoring.
     """
     logger.info(
-        f"Starting subscription email sending process for {interval} interval and {subscription_type} type..."
+        "Starting subscription email sending process for {} interval and {} type...",
+        interval,
+        subscription_type,
     )
 
     try:
@@ -58,27 +72,34 @@ async def send_subscription_emails(
 
         if not subscriptions:
             logger.info(
-                f"No active subscriptions found for {interval} interval and {subscription_type} type"
+                "No active subscriptions found for {} interval and {} type",
+                interval,
+                subscription_type,
             )
             return
 
         logger.info(
-            f"Processing {len(subscriptions)} active subscriptions for {interval} interval and {subscription_type} type"
+            "Processing {} active subscriptions for {} interval and {} type",
+            len(subscriptions),
+            interval,
+            subscription_type,
         )
 
-        # Step 2-3: Process subscriptions and prepare emails
-        email_messages, skipped_count = await _prepare_subscription_emails(
-            subscriptions, interval, subscription_type
+        # Step 2: One batched query for every subscription's entries. The
+        # date window is evaluated exactly once here, so every subscription
+        # in this run sees the same range (no datetime drift between rows).
+        interval_datetimes = interval.passed_interval_datestime
+        entries_by_subscription = await fetch_entries_for_subscriptions(
+            subscriptions, interval_datetimes, subscription_type
         )
 
-        # Step 4: Send emails in bulk if any were prepared
-        if email_messages:
-            await _send_bulk_emails(email_messages, skipped_count)
-        else:
-            logger.info("No emails to send - all subscriptions had no new entries")
+        # Steps 3-4: Render and send per subscription, pipelined with bounded
+        # concurrency - while one email is in flight to Mailgun the next
+        # subscription is already rendering.
+        await _render_and_send_emails(subscriptions, entries_by_subscription)
 
     except Exception as e:
-        logger.error(f"Critical error in send_subscription_emails: {e}")
+        logger.error("Critical error in send_subscription_emails: {}", e)
         raise
 
 
@@ -105,184 +126,297 @@ async def fetch_active_subscriptions(
         with proper async database operations in the future.
     """
     try:
-        if db.is_closed():
-            db.connect()
-
-        # Query for all active subscriptions that match the specified interval and type
-        subscription_models = list(
-            SubscriptionModel.select().where(
-                (SubscriptionModel.is_active)
-                & (SubscriptionModel.interval == interval.value)
-                & (SubscriptionModel.subscription_type == subscription_type.value)
-            )
+        # The peewee query is blocking; run it on the shared executor so the
+        # scheduler's event loop keeps servicing other jobs meanwhile.
+        subscription_models = await asyncio.get_running_loop().run_in_executor(
+            None, _query_active_subscriptions, interval, subscription_type
         )
 
         # Convert database models to Pydantic objects
         subscriptions = [sub_model.to_pydantic() for sub_model in subscription_models]
 
         logger.info(
-            f"Fetched {len(subscriptions)} active subscriptions for {interval} interval and {subscription_type} type"
+            "Fetched {} active subscriptions for {} interval and {} type",
+            len(subscriptions),
+            interval,
+            subscription_type,
         )
         return subscriptions
 
     except Exception as e:
         logger.error(
-            f"Error fetching active subscriptions for {interval} and {subscription_type}: {e}"
+            "Error fetching active subscriptions for {} and {}: {}",
+            interval,
+            subscription_type,
+            e,
         )
         return []
 
 
-async def fetch_entries_for_subscription(
-    subscription: Subscription,
-    interval: SubscriptionInterval,
+def _query_active_subscriptions(
+    interval: SubscriptionInterval, subscription_type: EntrySubscriptionType
+) -> list:
+    """Blocking subscription query; meant for the executor."""
+    # Check a pooled connection out for the query and hand it straight back;
+    # no is_closed()/connect() probing on a maybe-stale socket.
+    with db.connection_context():
+        # Query for all active subscriptions that match the specified interval and type
+        return list(
+            SubscriptionModel.select().where(
+                (SubscriptionModel.is_active)
+                & (SubscriptionModel.interval == interval.value)
+                & (SubscriptionModel.subscription_type == subscription_type.value)
+            )
+        )
+
+
+async def fetch_entries_for_subscriptions(
+    subscriptions: List[Subscription],
+    interval_datetimes: IntervalDatetimes,
     subscription_type: EntrySubscriptionType,
-) -> List[Entry]:
+) -> Dict[str, List[dict]]:
     """
-    Fetch entries that match a subscription's geographic bounds and time interval.
+    Fetch the entries for all subscriptions at once and partition them.
+
+    One SELECT over the union of the subscription bboxes and the shared time
+    window replaces the previous query-per-subscription (N round-trips with
+    an identical shape); the rows are then assigned back to each subscription
+    with a vectorized numpy containment test over the entry coordinates.
 
     Args:
-        subscription: The subscription containing geographic filters
-        interval: The subscription interval to use for filtering entries by date range
-        subscription_type: The subscription type to determine which date field to use for filtering
+        subscriptions: The active subscriptions to match entries against
+        interval_datetimes: The shared date window, computed once per run
+        subscription_type: Determines which date field filters the entries
 
     Returns:
-        List of entries matching the subscription criteria
-
-    Note:
-        Currently uses synchronous database queries. This can be optimized
-        with proper async database operations in the future.
+        Mapping of subscription id to the entries inside its bbox
     """
+    if not subscriptions:
+        return {}
+
     try:
-        # Calculate time range based on provided interval
-        interval_datetimes = interval.passed_interval_datestime
+        # Blocking peewee query -> shared executor, same as the
+        # subscription fetch. Rows come back already template-formatted from
+        # one fused streaming pass.
+        entries, lat_list, lng_list = await asyncio.get_running_loop().run_in_executor(
+            None,
+            _query_entries_in_bbox,
+            subscriptions,
+            interval_datetimes,
+            subscription_type,
+        )
 
-        # Ensure database connection is available
-        from src.kvmflows.database.db import db
-
-        if db.is_closed():
-            db.connect()
-
-        # Query entries within geographic bounds and time range
-        # Use different date fields based on subscription type
-        if subscription_type == EntrySubscriptionType.CREATES:
-            # For creates, filter by created_at
-            entry_models = list(
-                EntryModel.select().where(
-                    (EntryModel.lat >= subscription.lat_min)
-                    & (EntryModel.lat <= subscription.lat_max)
-                    & (EntryModel.lng >= subscription.lon_min)
-                    & (EntryModel.lng <= subscription.lon_max)
-                    & (EntryModel.created.is_null(False))  # Ensure created is not null
-                    & (EntryModel.created >= interval_datetimes.start_datetime)
-                    & (EntryModel.created < interval_datetimes.end_datetime)
-                )
-            )
-        elif subscription_type == EntrySubscriptionType.UPDATES:
-            # For updates, filter by updated_at
-            entry_models = list(
-                EntryModel.select().where(
-                    (EntryModel.lat >= subscription.lat_min)
-                    & (EntryModel.lat <= subscription.lat_max)
-                    & (EntryModel.lng >= subscription.lon_min)
-                    & (EntryModel.lng <= subscription.lon_max)
-                    & (
-                        EntryModel.updated_at.is_null(False)
-                    )  # Ensure updated_at is not null
-                    & (EntryModel.updated_at >= interval_datetimes.start_datetime)
-                    & (EntryModel.updated_at < interval_datetimes.end_datetime)
-                )
-            )
-        else:
-            # For other types (like TAGS), default to updated_at for now
-            entry_models = list(
-                EntryModel.select().where(
-                    (EntryModel.lat >= subscription.lat_min)
-                    & (EntryModel.lat <= subscription.lat_max)
-                    & (EntryModel.lng >= subscription.lon_min)
-                    & (EntryModel.lng <= subscription.lon_max)
-                    & (
-                        EntryModel.updated_at.is_null(False)
-                    )  # Ensure updated_at is not null
-                    & (EntryModel.updated_at >= interval_datetimes.start_datetime)
-                    & (EntryModel.updated_at < interval_datetimes.end_datetime)
-                )
-            )
+        if not entries:
+            return {subscription.id: [] for subscription in subscriptions}
 
-        # Convert database models to Pydantic objects
-        entries = [entry_model.to_pydantic() for entry_model in entry_models]
+        lats = np.asarray(lat_list, dtype=float)
+        lngs = np.asarray(lng_list, dtype=float)
+
+        entries_by_subscription: Dict[str, List[dict]] = {}
+        for subscription in subscriptions:
+            inside = (
+                (lats >= subscription.lat_min)
+                & (lats <= subscription.lat_max)
+                & (lngs >= subscription.lon_min)
+                & (lngs <= subscription.lon_max)
+            )
+            entries_by_subscription[subscription.id] = [
+                entries[i] for i in np.flatnonzero(inside)
+            ]
 
         logger.debug(
-            f"Fetched {len(entries)} entries for subscription {subscription.id} "
-            f"(lat: {subscription.lat_min}-{subscription.lat_max}, "
-            f"lng: {subscription.lon_min}-{subscription.lon_max}, "
-            f"time: {interval_datetimes.start_datetime} to {interval_datetimes.end_datetime}, "
-            f"type: {subscription_type})"
+            "Fetched {} entries for {} subscriptions in one query "
+            "(time: {} to {}, type: {})",
+            len(entries),
+            len(subscriptions),
+            interval_datetimes.start_datetime,
+            interval_datetimes.end_datetime,
+            subscription_type,
         )
-        return entries
+        return entries_by_subscription
 
     except Exception as e:
-        logger.error(f"Error fetching entries for subscription {subscription.id}: {e}")
-        return []
+        logger.error("Error fetching entries for subscriptions: {}", e)
+        return {}
+
+
+def _query_entries_in_bbox(subscriptions, interval_datetimes, subscription_type):
+    """Blocking union-bbox entry query; meant for the executor."""
+    # For creates filter by created, otherwise (updates, tags) by updated_at
+    if subscription_type == EntrySubscriptionType.CREATES:
+        date_field = EntryModel.created
+    else:
+        date_field = EntryModel.updated_at
+
+    # Pooled checkout for the duration of this one query. The iterator
+    # streams rows without peewee's result caching, and one fused pass
+    # produces the template-ready dict plus the coordinate columns - no
+    # intermediate list of raw rows, no second formatting sweep later.
+    formatted: List[dict] = []
+    lat_list: List[float] = []
+    lng_list: List[float] = []
+    with db.connection_context():
+        for row in _select_entries_in_bbox(
+            subscriptions, interval_datetimes, date_field
+        ).iterator():
+            formatted.append(_format_entry_for_template(row))
+            lat_list.append(row["lat"])
+            lng_list.append(row["lng"])
+    return formatted, lat_list, lng_list
+
+
+# The projection never changes between runs; build it once so each flow run
+# only binds the bbox/time parameters instead of re-listing 13 field nodes.
+# (Server-side PREPARE would not survive the pool's connection rotation on
+# this psycopg2 backend, so amortizing the Python-side build is the win.)
+_ENTRY_EMAIL_COLUMNS = (
+    EntryModel.id,
+    EntryModel.title,
+    EntryModel.description,
+    # The template only shows the first category; picking it in SQL
+    # (arrays are 1-indexed) keeps the rest of the array off the wire.
+    SQL('"categories"[1] AS "first_category"'),
+    EntryModel.tags,
+    EntryModel.street,
+    EntryModel.zip,
+    EntryModel.city,
+    EntryModel.homepage,
+    EntryModel.email,
+    EntryModel.telephone,
+    EntryModel.lat,
+    EntryModel.lng,
+)
+
+
+def _select_entries_in_bbox(subscriptions, interval_datetimes, date_field):
+    # Box containment instead of four scalar comparisons: the predicate
+    # matches the functional GiST index on point(lng, lat), so the planner
+    # descends the R-tree rather than range-scanning a single axis.
+    bbox = SQL(
+        "point(lng, lat) <@ box(point(%s, %s), point(%s, %s))",
+        (
+            min(s.lon_min for s in subscriptions),
+            min(s.lat_min for s in subscriptions),
+            max(s.lon_max for s in subscriptions),
+            max(s.lat_max for s in subscriptions),
+        ),
+    )
+
+    # Only the columns the email template (and the bbox partitioning)
+    # consume; .dicts() skips per-row Model hydration entirely.
+    return (
+        EntryModel.select(*_ENTRY_EMAIL_COLUMNS)
+        .dicts()
+        .where(
+            bbox
+            & date_field.is_null(False)
+            & (date_field >= interval_datetimes.start_datetime)
+            & (date_field < interval_datetimes.end_datetime)
+        )
+    )
+
+
+# Config is validated once at startup and never mutated; capture the values
+# the per-subscription path needs so each email costs zero pydantic
+# attribute-chain walks.
+_EMAIL_DOMAIN = config.email.domain
+_UNSUBSCRIBE_URL = config.email.unsubscribe_url
+_EMAIL_SENDER = config.email.area_subscription_creates.sender
+_EMAIL_SUBJECT = config.email.area_subscription_creates.subject
 
 
 # =============================================================================
-# STEP 2: EMAIL PREPARATION - Process subscriptions and prepare email content
+# STEP 3-4: EMAIL PREPARATION AND SENDING - Render and dispatch per subscription
 # =============================================================================
 
 
-async def _prepare_subscription_emails(
+async def _render_and_send_emails(
     subscriptions: List[Subscription],
-    interval: SubscriptionInterval,
-    subscription_type: EntrySubscriptionType,
-) -> tuple[List[EmailMessage], int]:
+    entries_by_subscription: Dict[str, List[dict]],
+) -> None:
     """
-    Process subscriptions and prepare email messages for bulk sending.
+    Render and send one email per subscription with bounded concurrency.
+
+    Rendering and sending are pipelined: the semaphore only gates the HTTP
+    call to Mailgun, so subscription N+1 renders while N's request is in
+    flight, instead of preparing every message before the first send.
 
     Args:
         subscriptions: List of active subscriptions to process
-        interval: The subscription interval to use for filtering entries by date range
-        subscription_type: The subscription type to determine entry filtering criteria
-
-    Returns:
-        Tuple of (email_messages, skipped_count)
+        entries_by_subscription: Entries partitioned per subscription id
     """
-    email_messages = []
-    skipped_count = 0
-
-    for subscription in subscriptions:
-        try:
-            logger.debug(
-                f"Processing subscription {subscription.id} for {subscription.email}"
-            )
-
-            # Fetch entries matching this subscription's criteria
-            entries = await fetch_entries_for_subscription(
-                subscription, interval, subscription_type
-            )
+    sender = MailgunSender(domain=config.email.domain, api_key=config.email.api_key)
+    semaphore = asyncio.Semaphore(config.email.concurrency)
+    # Entries shared by overlapping subscriptions render their HTML block
+    # only once per run.
+    entry_html_cache: Dict[str, str] = {}
 
-            if not entries:
-                logger.debug(f"No new entries found for subscription {subscription.id}")
-                skipped_count += 1
-                continue
+    async def process_subscription(subscription: Subscription) -> str:
+        entries = entries_by_subscription.get(subscription.id, [])
+        if not entries:
+            logger.debug("No new entries found for subscription {}", subscription.id)
+            return "skipped"
 
-            logger.info(
-                f"Found {len(entries)} new entries for subscription {subscription.id}"
-            )
+        logger.info(
+            "Found {} new entries for subscription {}", len(entries), subscription.id
+        )
+        # Rendering is pure CPU; doing it on the executor keeps the event
+        # loop free to drive the in-flight Mailgun requests. (A process
+        # pool would add pickling of every context for renders that are
+        # sub-millisecond with the cached templates.)
+        message = await asyncio.get_running_loop().run_in_executor(
+            None, _create_email_message, subscription, entries, entry_html_cache
+        )
+        async with semaphore:
+            await sender.send_email_async(message)
+        return "sent"
+
+    async def guarded(subscription: Subscription):
+        # One failed send must not cancel its siblings, so failures are
+        # returned as values; the TaskGroup still guarantees every task is
+        # awaited or cancelled even if this coroutine is interrupted.
+        try:
+            return await process_subscription(subscription)
+        except Exception as e:
+            return e
 
-            # Create email message for this subscription
-            message = _create_email_message(subscription, entries)
-            email_messages.append(message)
+    try:
+        async with asyncio.TaskGroup() as tg:
+            tasks = [tg.create_task(guarded(s)) for s in subscriptions]
+        results = [task.result() for task in tasks]
+    finally:
+        # Always clean up the sender connection
+        await sender.close_async()
 
-        except Exception as e:
-            logger.error(f"Error processing subscription {subscription.id}: {e}")
-            skipped_count += 1
-            continue
+    # One filtered pass for the failures; the other counts derive from
+    # lengths instead of extra scans over the result list.
+    errors = [
+        (subscription.email, result)
+        for subscription, result in zip(subscriptions, results)
+        if isinstance(result, BaseException)
+    ]
+    for email, error in errors:
+        logger.warning("Failed to send email to {}: {}", email, error)
+    error_count = len(errors)
+    skipped_count = sum(1 for result in results if result == "skipped")
+    success_count = len(results) - error_count - skipped_count
 
-    return email_messages, skipped_count
+    if success_count or error_count:
+        logger.success(
+            "Bulk email sending completed. "
+            "{} successful, {} failed, {} skipped (no new entries)",
+            success_count,
+            error_count,
+            skipped_count,
+        )
+    else:
+        logger.info("No emails to send - all subscriptions had no new entries")
 
 
 def _create_email_message(
-    subscription: Subscription, entries: List[Entry]
+    subscription: Subscription,
+    entries: List[dict],
+    entry_html_cache: Optional[Dict[str, str]] = None,
 ) -> EmailMessage:
     """
     Create an email message for a subscription with its entries.
@@ -290,6 +424,7 @@ def _create_email_message(
     Args:
         subscription: The subscription to create email for
         entries: List of entries to include in the email
+        entry_html_cache: Optional per-run cache of rendered entry blocks
 
     Returns:
         EmailMessage ready for sending
@@ -299,17 +434,16 @@ def _create_email_message(
         subscription=subscription,
         entries=entries,
         interval=subscription.interval,
-        domain=config.email.domain,
-        unsubscribe_link=config.email.unsubscribe_url.format(
-            subscription_id=subscription.id
-        ),
+        domain=_EMAIL_DOMAIN,
+        unsubscribe_link=_UNSUBSCRIBE_URL.format(subscription_id=subscription.id),
+        entry_html_cache=entry_html_cache,
     )
 
     # Create and return the email message
     return EmailMessage(
-        sender=config.email.area_subscription_creates.sender,
+        sender=_EMAIL_SENDER,
         to=subscription.email,
-        subject=config.email.area_subscription_creates.subject,
+        subject=_EMAIL_SUBJECT,
         html=email_content,
     )
 
@@ -321,20 +455,22 @@ def _create_email_message(
 
 def render_subscription_template(
     subscription: Subscription,
-    entries: List[Entry],
+    entries: List[dict],
     interval: str,
     domain: str,
     unsubscribe_link: str,
+    entry_html_cache: Optional[Dict[str, str]] = None,
 ) -> str:
     """
     Render the subscription email template with the provided data.
 
     Args:
         subscription: The subscription object containing user preferences
-        entries: List of entries to include in the email
+        entries: Formatted entry dicts (_format_entry_for_template output)
         interval: The subscription interval (hourly, daily, weekly)
         domain: The domain for entry links
         unsubscribe_link: The unsubscribe link for the footer
+        entry_html_cache: Optional per-run cache of rendered entry blocks
 
     Returns:
         The rendered HTML/text content ready for email sending
@@ -348,12 +484,10 @@ def render_subscription_template(
     if not template_path.exists():
         raise FileNotFoundError(f"Template not found at {template_path}")
 
-    # Load template content
-    with open(template_path, "r", encoding="utf-8") as f:
-        template_content = f.read()
-
-    # Initialize liquid template engine
-    template = Template(template_content)
+    # get_template is cached by the environment; with auto_reload off the
+    # parse happens once per process (or never, when the bytecode cache from
+    # an earlier run is still warm).
+    template = _JINJA_ENV.get_template(template_path.name)
 
     # Prepare template variables
     context = _build_template_context(
@@ -362,18 +496,31 @@ def render_subscription_template(
         interval=interval,
         domain=domain,
         unsubscribe_link=unsubscribe_link,
+        entry_html_cache=entry_html_cache,
     )
 
     # Render and return the email content
     return template.render(**context)
 
 
+# One environment for the whole process: get_template caches the compiled
+# template in memory, and the bytecode cache persists the compiled form on
+# disk so even a fresh process start skips the parse.
+_JINJA_ENV = Environment(
+    loader=FileSystemLoader(Path(config.email.templates.subscription_email).parent),
+    bytecode_cache=FileSystemBytecodeCache(),
+    auto_reload=False,
+    autoescape=select_autoescape(["html"]),
+)
+
+
 def _build_template_context(
     subscription: Subscription,
-    entries: List[Entry],
+    entries: List[dict],
     interval: str,
     domain: str,
     unsubscribe_link: str,
+    entry_html_cache: Optional[Dict[str, str]] = None,
 ) -> dict:
     """
     Build the context dictionary for template rendering.
@@ -394,100 +541,80 @@ def _build_template_context(
             "id": subscription.id,
             "email": subscription.email,
         },
-        "entries": [_format_entry_for_template(entry) for entry in entries],
+        "count": len(entries),
+        "entries_html": _render_entries_html(entries, domain, entry_html_cache),
         "interval": interval,
         "domain": domain,
         "unsubscribe_link": unsubscribe_link,
     }
 
 
-def _format_entry_for_template(entry: Entry) -> dict:
-    """
-    Format a single entry for template rendering.
-
-    Args:
-        entry: The entry to format
-
-    Returns:
-        Dictionary with formatted entry data
-    """
-    # Build address line from available components
-    address_parts = [entry.street or "", entry.zip or "", entry.city or ""]
-    address_line = " ".join(part for part in address_parts if part).strip() or None
-
-    return {
-        "id": entry.id,
-        "title": entry.title,
-        "description": entry.description,
-        "category": entry.categories[0] if entry.categories else None,
-        "tags": ", ".join(entry.tags) if entry.tags else None,
-        "address_line": address_line,
-        "homepage": entry.homepage,
-        "email": entry.email,
-        "phone": entry.telephone,
-    }
-
-
-# =============================================================================
-# STEP 4: EMAIL SENDING - Send emails in bulk and handle results
-# =============================================================================
-
-
-async def _send_bulk_emails(email_messages: List[EmailMessage], skipped_count: int):
+def _render_entries_html(
+    entries: List[dict],
+    domain: str,
+    entry_html_cache: Optional[Dict[str, str]] = None,
+) -> str:
     """
-    Send a list of email messages in bulk and log results.
+    Render the per-entry blocks through their own small template.
 
-    Args:
-        email_messages: List of emails to send
-        skipped_count: Number of subscriptions that were skipped
+    Splitting the entry block out of the main template means the outer
+    header/footer render only walks a handful of nodes. With a per-run
+    cache, subscribers with overlapping bboxes share the rendered block for
+    each common entry instead of re-rendering it per email.
     """
-    logger.info(f"Sending {len(email_messages)} emails in bulk...")
-
-    # Initialize the email sender
-    sender = MailgunSender(domain=config.email.domain, api_key=config.email.api_key)
-
-    try:
-        # Send emails in bulk
-        results = await sender.send_bulk_emails(email_messages)
-
-        # Analyze and log results
-        success_count, error_count = _analyze_email_results(results, email_messages)
-
-        logger.success(
-            f"Bulk email sending completed. "
-            f"{success_count} successful, {error_count} failed, {skipped_count} skipped (no new entries)"
+    entry_template = _JINJA_ENV.get_template("subscription_entry.html")
+    if entry_html_cache is None:
+        return "".join(
+            entry_template.render(entry=entry, domain=domain) for entry in entries
         )
 
-    finally:
-        # Always clean up the sender connection
-        await sender.close_async()
+    blocks = []
+    for entry in entries:
+        block = entry_html_cache.get(entry["id"])
+        if block is None:
+            block = entry_template.render(entry=entry, domain=domain)
+            entry_html_cache[entry["id"]] = block
+        blocks.append(block)
+    return "".join(blocks)
 
 
-def _analyze_email_results(
-    results: List, email_messages: List[EmailMessage]
-) -> tuple[int, int]:
+def _format_entry_for_template(entry: dict) -> dict:
     """
-    Analyze email sending results and log individual failures.
+    Format a single entry for template rendering.
 
     Args:
-        results: List of results from bulk email sending
-        email_messages: List of email messages that were sent
+        entry: The entry to format
 
     Returns:
-        Tuple of (success_count, error_count)
+        Dictionary with formatted entry data
     """
-    success_count = 0
-    error_count = 0
-
-    for i, result in enumerate(results):
-        if isinstance(result, Exception):
-            error_count += 1
-            logger.warning(f"Failed to send email to {email_messages[i].to}: {result}")
-        else:
-            success_count += 1
-            logger.debug(f"Successfully sent email to {email_messages[i].to}")
-
-    return success_count, error_count
+    # Build address line from available components
+    # Straight-line appends: no generator protocol inside join and no
+    # filtering pass over padded placeholders. Runs once per entry per run.
+    street = entry["street"]
+    zip_code = entry["zip"]
+    city = entry["city"]
+    parts = []
+    if street:
+        parts.append(street)
+    if zip_code:
+        parts.append(zip_code)
+    if city:
+        parts.append(city)
+    address_line = " ".join(parts) if parts else None
+
+    tags = entry["tags"]
+    return {
+        "id": entry["id"],
+        "title": entry["title"],
+        "description": entry["description"],
+        "category": entry["first_category"],
+        "tags": ", ".join(tags) if tags else None,
+        "address_line": address_line,
+        "homepage": entry["homepage"],
+        "email": entry["email"],
+        "phone": entry["telephone"],
+    }
 
 
 # =============================================================================
@@ -565,7 +692,19 @@ def _test_template_rendering():
     try:
         rendered_content = render_subscription_template(
             subscription=mock_subscription,
-            entries=mock_entries,
+            # The render path consumes pre-formatted entry dicts now
+            entries=[
+                _format_entry_for_template(
+                    {
+                        **entry.model_dump(),
+                        # the real query projects this in SQL
+                        "first_category": entry.categories[0]
+                        if entry.categories
+                        else None,
+                    }
+                )
+                for entry in mock_entries
+            ],
             interval="daily",
             domain="kartevonmorgen.org",
             unsubscribe_link="https://kartevonmorgen.org/unsubscribe/sub-123",
@@ -577,14 +716,12 @@ def _test_template_rendering():
         print("=" * 50)
 
     except Exception as e:
-        logger.error(f"Error rendering template: {e}")
+        logger.error("Error rendering template: {}", e)
         raise
 
 
 def _test_complete_flow():
     """Test the complete subscription email flow (SENDS ACTUAL EMAILS)."""
-    import asyncio
-
     async def run_test():
         try:
             print("Testing complete subscription email flow...")
@@ -594,7 +731,7 @@ def _test_complete_flow():
             )
             print("Flow completed successfully!")
         except Exception as e:
-            logger.error(f"Error in complete flow: {e}")
+            logger.error("Error in complete flow: {}", e)
             raise
 
     asyncio.run(run_test())
@@ -0,0 +1,165 @@
+import time
+import asyncio
+import numpy as np
+
+from loguru import logger
+from typing import List
+
+from src.kvmflows.flows.bulk_upsert_entries import bulk_upsert_entries
+from src.kvmflows.ofdb.entries import get_entries
+from src.kvmflows.config.config import config
+from src.kvmflows.ofdb.search import SearchParams, search
+from src.kvmflows.utils.memory_monitor import monitor_memory
+
+
+@monitor_memory("sync_all_entries")
+async def sync_all_entries():
+    """
+    Sync all entries by fetching data from OFDB and upserting to the database.
+    """
+
+    start_time = time.time()
+
+    # Process areas concurrently, but capped: every in-flight area holds its
+    # own HTTP fan-out plus upsert batches, so unbounded scheduling would
+    # scale sockets and peak memory with the size of config.areas.
+    area_semaphore = asyncio.Semaphore(config.ofdb.max_concurrent_areas)
+
+    async def process_area_guarded(area):
+        async with area_semaphore:
+            return await process_area(area)
+
+    area_tasks = []
+    for area in config.areas:
+        task = asyncio.create_task(process_area_guarded(area))
+        area_tasks.append(task)
+
+    # Wait for all area processing tasks to complete
+    area_results = await asyncio.gather(*area_tasks, return_exceptions=True)
+
+    # Aggregate results
+    total_upserted = 0
+    max_numbers = 0
+    successful_areas = 0
+
+    for i, result in enumerate(area_results):
+        if isinstance(result, Exception):
+            logger.error("Error processing area {}: {}", config.areas[i].name, result)
+        elif isinstance(result, tuple) and len(result) == 2:
+            area_upserted, area_max_numbers = result
+            total_upserted += area_upserted
+            max_numbers = max(max_numbers, area_max_numbers)
+            successful_areas += 1
+        else:
+            logger.error(
+                "Unexpected result format for area {}: {}", config.areas[i].name, result
+            )
+            # Treat as failed area
+
+    elapsed = time.time() - start_time
+    logger.success(
+        "Update completed. Total entries upserted: {} from {}/{} areas. Elapsed time: {:.2f} seconds",
+        total_upserted,
+        successful_areas,
+        len(config.areas),
+        elapsed,
+    )
+    logger.info("Max visible entries in a chunk: {}", max_numbers)
+
+    # Force garbage collection to help with memory cleanup
+    import gc
+
+    gc.collect()
+
+
+@monitor_memory("process_area")
+async def process_area(area):
+    """
+    Process a single area by fetching and upserting its entries.
+
+    Args:
+        area: Area configuration object
+
+    Returns:
+        tuple: (upserted_count, max_numbers_in_chunk)
+    """
+    logger.info("Fetching entries for area: {}", area.name)
+    lats = np.linspace(area.lats[0], area.lats[1], num=area.lat_n_chunks)
+    lngs = np.linspace(area.lngs[0], area.lngs[1], num=area.lng_n_chunks)
+
+    # Format every grid boundary exactly once (the nested f-string loop
+    # re-formatted each interior latitude lng_n_chunks times and vice versa),
+    # then pair adjacent boundaries into cells.
+    lat_strs = [str(lat) for lat in lats]
+    lng_strs = [str(lng) for lng in lngs]
+    search_params: List[SearchParams] = [
+        SearchParams(bbox=f"{lat0},{lng0},{lat1},{lng1}")
+        for lat0, lat1 in zip(lat_strs, lat_strs[1:])
+        for lng0, lng1 in zip(lng_strs, lng_strs[1:])
+    ]
+
+    area_upserted = 0
+    max_numbers = 0
+
+    # Pipeline fetch and upsert: the DB write for one batch runs as a task
+    # while the next batch is being fetched, bounded so a slow database
+    # cannot pile up unbounded pending writes.
+    upsert_semaphore = asyncio.Semaphore(config.ofdb.upsert_concurrency)
+    upsert_tasks: List[asyncio.Task] = []
+
+    async def upsert_batch(entries):
+        async with upsert_semaphore:
+            return await bulk_upsert_entries(entries)
+
+    try:
+        async for search_result in search(search_params):
+            if not search_result.visible:
+                # logger.debug("No visible entries found in this area chunk")
+                continue
+
+            max_numbers = max(max_numbers, len(search_result.visible))
+
+            # Comprehension instead of map(lambda ...): no per-element Python
+            # call frame for a plain attribute read.
+            entry_ids = [e.id for e in search_result.visible]
+
+            try:
+                async for entry_result in get_entries(entry_ids):  # type: ignore
+                    if not entry_result:
+                        logger.debug("No entries found for the given IDs")
+                        continue
+
+                    upsert_tasks.append(
+                        asyncio.create_task(upsert_batch(entry_result))
+                    )
+            except Exception as e:
+                logger.error(
+                    "Error processing entries for area {}: {}", area.name, e
+                )
+                # Continue with next chunk instead of failing completely
+                continue
+    finally:
+        # Always await the scheduled writes, even if the search iteration
+        # itself blew up - otherwise they run detached and their results
+        # (or errors) are dropped.
+        for result in await asyncio.gather(*upsert_tasks, return_exceptions=True):
+            if isinstance(result, BaseException):
+                logger.error(
+                    "Error upserting entries for area {}: {}", area.name, result
+                )
+            else:
+                area_upserted += result
+                logger.debug("Bulk upserted {} entries in this chunk", result)
+
+    logger.success("Completed area {}: {} entries upserted", area.name, area_upserted)
+    return area_upserted, max_numbers
+
+
+
+
+if __name__ == "__main__":
+    import asyncio
+
+    logger.info("Starting entry update process")
+    asyncio.run(sync_all_entries())
+    logger.info("Entry update process completed")
@@ -4,6 +4,8 @@ Email activation utility for sending subscription activation emails.
 This module handles rendering and sending activation emails using liquid templates.
 """
 
+import functools
+
 from pathlib import Path
 from typing import Optional
 from loguru import logger
@@ -13,6 +15,18 @@ from src.kvmflows.config.config import config
 from src.kvmflows.mail.mailgun import MailgunSender, EmailMessage
 
 
+@functools.lru_cache(maxsize=None)
+def _load_template(path: str, mtime: float) -> Template:
+    """Read and parse the template once per (path, mtime).
+
+    The mtime in the key means an edited template is picked up without
+    restarting the process, while repeat sends skip the file read and the
+    Liquid parse entirely.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        return Template(f.read())
+
+
 async def send_activation_email(
     subscription_id: str,
     email: str,
@@ -87,12 +101,9 @@ def render_activation_template(activation_link: str, subscription_title: str) ->
     if not template_path.exists():
         raise FileNotFoundError(f"Activation template not found at {template_path}")
 
-    # Load template content
-    with open(template_path, "r", encoding="utf-8") as f:
-        template_content = f.read()
-
-    # Initialize liquid template engine
-    template = Template(template_content)
+    # Compiled once per (path, mtime); every activation email after the
+    # first reuses the parsed template.
+    template = _load_template(str(template_path), template_path.stat().st_mtime)
 
     # Prepare template variables
     context = {
@@ -2,7 +2,7 @@ import asyncio
 import httpx
 import time
 
-from pydantic import BaseModel
+from dataclasses import dataclass
 from loguru import logger
 from typing import List, Dict, Any, Optional, Union, cast
 from sys import exit
@@ -10,7 +10,15 @@ from sys import exit
 from src.kvmflows.config.config import config
 
 
-class EmailMessage(BaseModel):
+@dataclass(slots=True)
+class EmailMessage:
+    """Outgoing email; a plain struct, the fields are all internal.
+
+    Pydantic validation here only re-checked strings we just rendered
+    ourselves - with multi-KB HTML bodies per message that was measurable
+    copy/validate work, and slots halve the per-instance memory.
+    """
+
     sender: str
     to: Union[str, List[str]]
     subject: str
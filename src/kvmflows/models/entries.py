@@ -1,16 +1,22 @@
 from typing import List, Optional
 from datetime import datetime
-from pydantic import BaseModel, field_validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 
 
 class Entry(BaseModel):
+    # Entries are read-only once parsed; freezing lets pydantic skip the
+    # mutation bookkeeping and makes instances hashable/shareable.
+    model_config = ConfigDict(frozen=True)
+
     id: str
     created: datetime
     version: int
     title: str
     description: str
-    lat: float
-    lng: float
+    # Coordinate bounds are enforced here at the trust boundary, where the
+    # data enters from OFDB, rather than per-row in the database.
+    lat: float = Field(ge=-90, le=90)
+    lng: float = Field(ge=-180, le=180)
     street: Optional[str] = None
     zip: Optional[str] = None
     city: Optional[str] = None
@@ -1,8 +0,0 @@
-from enum import StrEnum
-
-
-class ReviewStatus(StrEnum):
-    CREATED = 'created'
-    CONFIRMED = 'confirmed'
-    REJECTED = 'rejected'
-    ARCHIVED = 'archived'
\ No newline at end of file
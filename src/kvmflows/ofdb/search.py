@@ -42,6 +42,10 @@ async def search(params: List[SearchParams]) -> AsyncGenerator[SearchResult, Non
             )
         )
         async for response in client.bulk_get_generator(urls):
+            if isinstance(response, Exception):
+                # One failed cell must not abort the whole area sweep.
+                logger.error(f"Error searching entries: {response}")
+                continue
             yield SearchResult.model_validate(response)
 
 
@@ -0,0 +1,12 @@
+"""
+Process-wide thread pool shared by every event loop.
+
+asyncio creates a fresh default ThreadPoolExecutor per loop, so code that
+builds loops repeatedly (scheduled jobs) would otherwise respawn threads on
+every run and lose any thread-local DB state between fires.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+
+SHARED_EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix="kvmflows-db")